@@ -1,11 +1,7 @@
-from collections import OrderedDict
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, Literal, Optional
-import os
-import concurrent.futures
-import multiprocessing
-from concurrent.futures import Future
-from multiprocessing.managers import DictProxy
+from typing import Any, Optional
+import mmap
 
 import polars as pl
 from rich.progress import (
@@ -14,7 +10,6 @@ from rich.progress import (
     BarColumn,
     TaskProgressColumn,
     TimeRemainingColumn,
-    TaskID,
 )
 from rich import print
 from resulty import Ok, Err, Result, propagate_result
@@ -42,12 +37,15 @@ from src.schema import (
     hispanic_origin_race_recode_mapping,
     dataset_schema,
 )
-from src.utils import try_parse_int, get_in_range, range_keyed_dict_has_key, maybe_del
+from src.utils import range_keyed_dict_to_table
 
 DATASET_DIR = Path(__file__).resolve().parent.parent / "datasets"
 DATASET_PATH = DATASET_DIR / "VS22MORT-1.DUSMCPUB_r20240307"
 OUTPUT_PATH = DATASET_DIR / "MMCD_2022.parquet"
-MAX_PARALLEL_PROCESSING = max((os.cpu_count() or 0) - 2, 1)
+MAX_PARALLEL_PROCESSING = pl.thread_pool_size()
+# Bounds the number of fields decoded across all the chunks of records, so that
+# the wider the records, the fewer the chunks they are split into
+CHUNK_FIELDS_BUDGET = 500_000
 
 global progress
 
@@ -523,95 +521,6 @@ mapping = {
     (816, 817): "decedents_usual_occindu_industry_recode",
 }
 
-
-@propagate_result
-def process_record_type(
-    value: str,
-) -> Result[tuple[Literal["record_type"], Optional[str]], str]:
-    if value == "":
-        return Ok(("record_type", None))
-
-    v = try_parse_int(value).up()
-    mapped = record_type_mapping.get(v)
-    if mapped:
-        return Ok(("record_type", mapped))
-    else:
-        return Err(f"Invalid value for record_type: {v}")
-
-
-@propagate_result
-def process_resident_status(
-    value: str,
-) -> Result[tuple[Literal["resident_status"], Optional[str]], str]:
-    if value == "":
-        return Ok(("resident_status", None))
-
-    v = try_parse_int(value).up()
-    mapped = resident_status_mapping.get(v)
-    if mapped:
-        return Ok(("resident_status", mapped))
-    else:
-        return Err(f"Invalid value for resident_status: {v}")
-
-
-@propagate_result
-def process_education(
-    value: str,
-) -> Result[tuple[Literal["education"], Optional[str]], str]:
-    if value == "":
-        return Ok(("education", None))
-
-    v = try_parse_int(value).up()
-    mapped = education_mapping.get(v)
-    if mapped or v in education_mapping.keys():
-        return Ok(("education", mapped))
-    else:
-        return Err(f"Invalid value for education: {v}")
-
-
-@propagate_result
-def process_education_reporting_flag(
-    value: str,
-) -> Result[tuple[Literal["education_reporting_flag"], Optional[str]], str]:
-    if value == "":
-        return Ok(("education_reporting_flag", None))
-
-    v = try_parse_int(value).up()
-    mapped = education_reporting_flag_mapping.get(v)
-    if mapped:
-        return Ok(("education_reporting_flag", mapped))
-    else:
-        return Err(f"Invalid value for education_reporting_flag: {v}")
-
-
-@propagate_result
-def process_month_of_death(
-    value: str,
-) -> Result[tuple[Literal["month_of_death"], Optional[int]], str]:
-    if value == "":
-        return Ok(("month_of_death", None))
-
-    v = try_parse_int(value).up()
-    if 1 <= v <= 12:
-        return Ok(("month_of_death", v))
-    else:
-        return Err(f"Invalid value for month_of_death: {v}")
-
-
-@propagate_result
-def process_sex(
-    value: str,
-) -> Result[tuple[Literal["sex"], Optional[str]], str]:
-    if value == "":
-        return Ok(("sex", None))
-
-    mapped = sex_mapping.get(value)
-    if mapped:
-        return Ok(("sex", mapped))
-    else:
-        return Err(f"Invalid value for sex: {value}")
-
-
 MINUTES_AS_MS = 60_000
 HOURS_AS_MS = 60 * MINUTES_AS_MS
 DAYS_AS_MS = 24 * HOURS_AS_MS
@@ -619,868 +528,734 @@ MONTHS_AS_MS = 30 * DAYS_AS_MS
 YEARS_AS_MS = 365 * DAYS_AS_MS
 
 
-@propagate_result
-def process_detail_age(
-    value: str,
-) -> Result[tuple[Literal["detail_age"], Optional[int]], str]:
-    if value == "":
-        return Ok(("detail_age", None))
-
-    based_on, count = (
-        try_parse_int(value[:1]).up(),
-        try_parse_int(value[1:]).up(),
-    )
-
-    if 1 <= based_on <= 6:
-        mult: float = {
-            1: YEARS_AS_MS,
-            2: MONTHS_AS_MS,
-            4: DAYS_AS_MS,
-            5: HOURS_AS_MS,
-            6: MINUTES_AS_MS,
-        }[based_on]
-
-        return Ok(("detail_age", int(count * mult)))
-    else:
-        return Ok(("detail_age", None))
-
-
-@propagate_result
-def process_age_substitution_flag(
-    value: str,
-) -> Result[tuple[Literal["age_substitution_flag"], bool], str]:
-    if value == "":
-        return Ok(("age_substitution_flag", False))
-
-    v = try_parse_int(value).up()
-
+def age_recode_52_range(v: int) -> tuple[int, int]:
     if v == 1:
-        return Ok(("age_substitution_flag", True))
+        return 0, HOURS_AS_MS
+    elif v == 2:
+        return HOURS_AS_MS, 23 * HOURS_AS_MS
+    elif 3 <= v <= 9:
+        i = v - 2
+        return i * DAYS_AS_MS, i * DAYS_AS_MS
+    elif 10 <= v <= 11:
+        i = v - 10
+        return (14 + 7 * i) * DAYS_AS_MS, (13 + 7 * (i + 1)) * DAYS_AS_MS
+    elif 12 <= v <= 22:
+        i = v - 11
+        return i * MONTHS_AS_MS, i * MONTHS_AS_MS
+    elif 23 <= v <= 26:
+        i = v - 22
+        return i * YEARS_AS_MS, i * YEARS_AS_MS
+    elif 27 <= v <= 50:
+        i = v - 27
+        return (5 + 5 * i) * YEARS_AS_MS, (4 + 5 * (i + 1)) * YEARS_AS_MS
     else:
-        return Err(f"Invalid value for age_substitution_flag: {value}")
+        return 125 * YEARS_AS_MS, 999 * YEARS_AS_MS
 
 
-@propagate_result
-def process_age_recode_52(
-    value: str,
-) -> Result[tuple[Literal["age_recode_52"], Optional[tuple[int, int]]], str]:
-    if value == "":
-        return Ok(("age_recode_52", None))
-
-    v = try_parse_int(value).up()
-    if 1 <= v <= 51:
-        if v == 1:
-            low = 0
-            upper = HOURS_AS_MS
-        elif v == 2:
-            low = HOURS_AS_MS
-            upper = 23 * HOURS_AS_MS
-        elif 3 <= v <= 9:
-            i = v - 2
-            low = i * DAYS_AS_MS
-            upper = i * DAYS_AS_MS
-        elif 10 <= v <= 11:
-            i = v - 10
-            low = (14 + 7 * i) * DAYS_AS_MS
-            upper = (13 + 7 * (i + 1)) * DAYS_AS_MS
-        elif 12 <= v <= 22:
-            i = v - 11
-            low = i * MONTHS_AS_MS
-            upper = i * MONTHS_AS_MS
-        elif 23 <= v <= 26:
-            i = v - 22
-            low = i * YEARS_AS_MS
-            upper = i * YEARS_AS_MS
-        elif 27 <= v <= 50:
-            i = v - 27
-            low = (5 + 5 * i) * YEARS_AS_MS
-            upper = (4 + 5 * (i + 1)) * YEARS_AS_MS
-        elif v == 51:
-            low = 125 * YEARS_AS_MS
-            upper = 999 * YEARS_AS_MS
-        else:
-            return Err(f"Invalid value for age_recode_52: {v}")
-        return Ok(("age_recode_52", (low, upper)))
-    elif v == 52:
-        return Ok(("age_recode_52", None))
+def age_recode_27_range(v: int) -> tuple[int, int]:
+    if v == 1:
+        return 0, 1 * MONTHS_AS_MS
+    elif v == 2:
+        return 1 * MONTHS_AS_MS, 11 * MONTHS_AS_MS
+    elif 3 <= v <= 6:
+        i = v - 2
+        return i * YEARS_AS_MS, i * YEARS_AS_MS
+    elif 7 <= v <= 25:
+        i = v - 7
+        return (5 + 5 * i) * YEARS_AS_MS, (4 + 5 * (i + 1)) * YEARS_AS_MS
     else:
-        return Err(f"Invalid value for age_recode_52: {v}")
+        return 100 * YEARS_AS_MS, 999 * YEARS_AS_MS
 
 
-@propagate_result
-def process_age_recode_27(
-    value: str,
-) -> Result[tuple[Literal["age_recode_27"], Optional[tuple[int, int]]], str]:
-    if value == "":
-        return Ok(("age_recode_27", None))
-
-    v = try_parse_int(value).up()
-    if 1 <= v <= 26:
-        if v == 1:
-            low = 0
-            upper = 1 * MONTHS_AS_MS
-        elif v == 2:
-            low = 1 * MONTHS_AS_MS
-            upper = 11 * MONTHS_AS_MS
-        elif 3 <= v <= 6:
-            i = v - 2
-            low = i * YEARS_AS_MS
-            upper = i * YEARS_AS_MS
-        elif 7 <= v <= 25:
-            i = v - 7
-            low = (5 + 5 * i) * YEARS_AS_MS
-            upper = (4 + 5 * (i + 1)) * YEARS_AS_MS
-        elif v == 26:
-            low = 100 * YEARS_AS_MS
-            upper = 999 * YEARS_AS_MS
-        else:
-            return Err(f"Invalid value for age_recode_27: {v}")
-        return Ok(("age_recode_27", (low, upper)))
-    elif v == 27:
-        return Ok(("age_recode_27", None))
+def age_recode_12_range(v: int) -> tuple[int, int]:
+    if v == 1:
+        return 0, 11 * MONTHS_AS_MS
+    elif v == 2:
+        return 1 * YEARS_AS_MS, 4 * YEARS_AS_MS
+    elif 3 <= v <= 10:
+        i = v - 3
+        return (5 + 10 * i) * YEARS_AS_MS, (4 + 10 * (i + 1)) * YEARS_AS_MS
     else:
-        return Err(f"Invalid value for age_recode_27: {v}")
+        return 85 * YEARS_AS_MS, 999 * YEARS_AS_MS
 
 
-@propagate_result
-def process_age_recode_12(
-    value: str,
-) -> Result[tuple[Literal["age_recode_12"], Optional[tuple[int, int]]], str]:
-    if value == "":
-        return Ok(("age_recode_12", None))
-
-    v = try_parse_int(value).up()
-    if 1 <= v <= 11:
-        if v == 1:
-            low = 0
-            upper = 11 * MONTHS_AS_MS
-        elif v == 2:
-            low = 1 * YEARS_AS_MS
-            upper = 4 * YEARS_AS_MS
-        elif 3 <= v <= 10:
-            i = v - 3
-            low = (5 + 10 * i) * YEARS_AS_MS
-            upper = (4 + 10 * (i + 1)) * YEARS_AS_MS
-        elif v == 11:
-            low = 85 * YEARS_AS_MS
-            upper = 999 * YEARS_AS_MS
-        else:
-            return Err(f"Invalid value for age_recode_12: {v}")
-        return Ok(("age_recode_12", (low, upper)))
-    elif v == 12:
-        return Ok(("age_recode_12", None))
+def infant_age_recode_22_range(v: int) -> tuple[int, int]:
+    if v == 1:
+        return 0, 59 * MINUTES_AS_MS
+    elif v == 2:
+        return 1 * HOURS_AS_MS, 23 * HOURS_AS_MS
+    elif 3 <= v <= 8:
+        i = v - 2
+        return i * DAYS_AS_MS, i * DAYS_AS_MS
+    elif 9 <= v <= 11:
+        i = v - 9
+        return (7 + 7 * i) * DAYS_AS_MS, (6 + 7 * (i + 1)) * DAYS_AS_MS
     else:
-        return Err(f"Invalid value for age_recode_12: {v}")
-
+        i = v - 11
+        return i * MONTHS_AS_MS, i * MONTHS_AS_MS
+
+
+# (low, upper) bounds of the age recodes, in milliseconds, by code. The codes
+# standing for an age that is not stated are left out, and decode to null.
+age_recode_52_bounds = {v: age_recode_52_range(v) for v in range(1, 52)}
+age_recode_27_bounds = {v: age_recode_27_range(v) for v in range(1, 27)}
+age_recode_12_bounds = {v: age_recode_12_range(v) for v in range(1, 12)}
+infant_age_recode_22_bounds = {v: infant_age_recode_22_range(v) for v in range(1, 23)}
+
+detail_age_unit_as_ms = {
+    1: YEARS_AS_MS,
+    2: MONTHS_AS_MS,
+    4: DAYS_AS_MS,
+    5: HOURS_AS_MS,
+    6: MINUTES_AS_MS,
+}
 
-@propagate_result
-def process_infant_age_recode_22(
-    value: str,
-) -> Result[tuple[Literal["infant_age_recode_22"], Optional[tuple[int, int]]], str]:
-    if value == "":
-        return Ok(("infant_age_recode_22", None))
-
-    v = try_parse_int(value).up()
-    if 1 <= v <= 22:
-        if v == 1:
-            low = 0
-            upper = 59 * MINUTES_AS_MS
-        elif v == 2:
-            low = 1 * HOURS_AS_MS
-            upper = 23 * HOURS_AS_MS
-        elif 3 <= v <= 8:
-            i = v - 2
-            low = i * DAYS_AS_MS
-            upper = i * DAYS_AS_MS
-        elif 9 <= v <= 11:
-            i = v - 9
-            low = (7 + 7 * i) * DAYS_AS_MS
-            upper = (6 + 7 * (i + 1)) * DAYS_AS_MS
-        elif 12 <= v <= 22:
-            i = v - 11
-            low = i * MONTHS_AS_MS
-            upper = i * MONTHS_AS_MS
-        else:
-            return Err(f"Invalid value for infant_age_recode_22: {v}")
-        return Ok(("infant_age_recode_22", (low, upper)))
+# The ranges of known hispanic origin codes, with the adjacent ones merged, so
+# that a code is checked against as few ranges as possible
+hispanic_origin_ranges: list[tuple[int, int]] = []
+for start, end in sorted(hispanic_origin_mapping):
+    if hispanic_origin_ranges and start == hispanic_origin_ranges[-1][1] + 1:
+        hispanic_origin_ranges[-1] = (hispanic_origin_ranges[-1][0], end)
     else:
-        return Err(f"Invalid value for infant_age_recode_22: {v}")
-
+        hispanic_origin_ranges.append((start, end))
 
-@propagate_result
-def process_place_of_death(
-    value: str,
-) -> Result[tuple[Literal["place_of_death"], Optional[str]], str]:
-    if value == "":
-        return Ok(("place_of_death", None))
+# (offset, length) of every field that is read from a record
+fields = {
+    field: (start - 1, end - start + 1)
+    for (start, end), field in mapping.items()
+    if field != "reserved_positions"
+}
 
-    v = try_parse_int(value).up()
 
-    mapped = place_of_death_mapping.get(v)
-    if mapped or v in place_of_death_mapping.keys():
-        return Ok(("place_of_death", mapped))
+# (offset, length) of the runs of fields that are at most a few reserved
+# positions apart. Slicing has to walk a record up to the offset of the slice,
+# so each run is sliced out of the records once, and its fields out of it.
+blocks: list[tuple[int, int]] = []
+for offset, length in sorted(fields.values()):
+    if blocks and offset - sum(blocks[-1]) <= 4:
+        block_offset, _ = blocks[-1]
+        blocks[-1] = (block_offset, offset + length - block_offset)
     else:
-        return Err(f"Invalid value for place_of_death_and_decedents_status: {value}")
+        blocks.append((offset, length))
 
 
-@propagate_result
-def process_marital_status(
-    value: str,
-) -> Result[tuple[Literal["marital_status"], Optional[str]], str]:
-    if value == "":
-        return Ok(("marital_status", None))
-
-    mapped = marital_status_mapping.get(value)
-    if mapped or value in marital_status_mapping.keys():
-        return Ok(("marital_status", mapped))
-    else:
-        return Err(f"Invalid value for marital_status: {value}")
+def record_slice(offset: int, length: int) -> pl.Expr:
+    """
+    Slices a part of the raw records, out of the block of fields holding it.
 
+    Args:
+      offset (int): The offset of the part in the records.
+      length (int): The length of the part.
 
-@propagate_result
-def process_day_of_week_of_death(
-    value: str,
-) -> Result[tuple[Literal["day_of_week_of_death"], Optional[str]], str]:
-    if value == "":
-        return Ok(("day_of_week_of_death", None))
+    Returns:
+      pl.Expr: The part of the records, as is.
 
-    v = try_parse_int(value).up()
+    """
+    block_offset, block_length = next(
+        (start, size)
+        for start, size in blocks
+        if start <= offset and offset + length <= start + size
+    )
+    return (
+        pl.col("raw")
+        .str.slice(block_offset, block_length)
+        .str.slice(offset - block_offset, length)
+    )
 
-    mapped = day_of_week_of_death_mapping.get(v)
-    if mapped or v in day_of_week_of_death_mapping.keys():
-        return Ok(("day_of_week_of_death", mapped))
-    else:
-        return Err(f"Invalid value for day_of_week_of_death: {value}")
 
+def slice_field(name: str) -> pl.Expr:
+    """
+    Slices a field out of the raw records.
 
-@propagate_result
-def process_injury_at_work(
-    value: str,
-) -> Result[tuple[Literal["injury_at_work"], Optional[str]], str]:
-    if value == "":
-        return Ok(("injury_at_work", None))
-
-    mapped = injury_at_work_mapping.get(value)
-    if mapped or value in injury_at_work_mapping.keys():
-        return Ok(("injury_at_work", mapped))
-    else:
-        return Err(f"Invalid value for injury_at_work: {value}")
+    Args:
+      name (str): The name of the field, as found in `mapping`.
 
+    Returns:
+      pl.Expr: The stripped value of the field, null when the field is blank.
 
-@propagate_result
-def process_manner_of_death(
-    value: str,
-) -> Result[tuple[Literal["manner_of_death"], Optional[str]], str]:
-    if value == "":
-        return Ok(("manner_of_death", None))
+    """
+    return record_slice(*fields[name]).str.strip_chars(" ").replace("", None)
 
-    v = try_parse_int(value).up()
 
-    mapped = manner_of_death_mapping.get(v)
-    if mapped:
-        return Ok(("manner_of_death", mapped))
-    else:
-        return Err(f"Invalid value for manner_of_death: {value}")
+def slice_axis_conditions(prefix: str) -> pl.Expr:
+    """
+    Slices the 20 consecutive conditions of an axis out of the raw records.
 
+    The conditions are taken from a single slice of the records, split into
+    fixed-width chunks, rather than from 20 separate fields.
 
-@propagate_result
-def process_method_of_disposition(
-    value: str,
-) -> Result[tuple[Literal["method_of_disposition"], Optional[str]], str]:
-    if value == "":
-        return Ok(("method_of_disposition", None))
-
-    mapped = method_of_disposition_mapping.get(value)
-    if mapped or value in method_of_disposition_mapping.keys():
-        return Ok(("method_of_disposition", mapped))
-    else:
-        return Err(f"Invalid value for method_of_disposition: {value}")
+    Args:
+      prefix (str): The name of the conditions, without their number.
 
+    Returns:
+      pl.Expr: The stripped conditions that are not blank, as a list.
 
-@propagate_result
-def process_autopsy(
-    value: str,
-) -> Result[tuple[Literal["autopsy"], Optional[str]], str]:
-    if value == "":
-        return Ok(("autopsy", None))
-
-    mapped = autopsy_mapping.get(value)
-    if mapped or value in autopsy_mapping.keys():
-        return Ok(("autopsy", mapped))
-    else:
-        return Err(f"Invalid value for autopsy: {value}")
-
-
-@propagate_result
-def process_activity_code(
-    value: str,
-) -> Result[tuple[Literal["activity_code"], Optional[str]], str]:
-    if value == "":
-        return Ok(("activity_code", None))
-
-    v = try_parse_int(value).up()
+    """
+    offset, length = fields[f"{prefix}_1"]
+    last_offset, _ = fields[f"{prefix}_20"]
+    value = pl.element().str.strip_chars(" ")
+    return (
+        record_slice(offset, last_offset + length - offset)
+        .str.extract_all(f".{{1,{length}}}")
+        .list.eval(value.filter(value != ""))
+    )
 
-    mapped = activity_code_mapping.get(v)
-    if mapped or v in activity_code_mapping.keys():
-        return Ok(("activity_code", mapped))
-    else:
-        return Err(f"Invalid value for activity_code: {value}")
 
+def split_fields(lines: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Slices the fields out of the raw records, each into its own column.
 
-@propagate_result
-def process_place_of_injury(
-    value: str,
-) -> Result[tuple[Literal["place_of_injury"], Optional[str]], str]:
-    if value == "":
-        return Ok(("place_of_injury", None))
+    The fields are sliced once, and then read by all the expressions decoding
+    and validating them. The conditions of each axis are sliced at once out of
+    the records, into a single column of lists.
 
-    v = try_parse_int(value).up()
-
-    mapped = place_of_injury_mapping.get(v)
-    if mapped or v in place_of_injury_mapping.keys():
-        return Ok(("place_of_injury", mapped))
-    else:
-        return Err(f"Invalid value for place_of_injury: {value}")
+    Args:
+      lines (pl.LazyFrame): The raw records, in a single "raw" column.
 
+    Returns:
+      pl.LazyFrame: The raw records, along with a column for each field.
 
-@propagate_result
-def process_icd_code(
-    value: str,
-) -> Result[tuple[Literal["icd_code"], Optional[str]], str]:
-    if value == "":
-        return Ok(("icd_code", None))
+    """
+    return lines.with_columns(
+        *(
+            slice_field(name).alias(name)
+            for name in fields
+            if "_axis_condition_" not in name
+        ),
+        *(
+            slice_axis_conditions(prefix).alias(prefix)
+            for prefix in ("entity_axis_condition", "record_axis_condition")
+        ),
+    )
 
-    return Ok(("icd_code", value))
 
+def code(name: str) -> pl.Expr:
+    """
+    Parses a numeric field into the narrowest integer type that holds it.
 
-@propagate_result
-def process_cause_recode_358(
-    value: str,
-) -> Result[tuple[Literal["cause_recode_358"], Optional[str]], str]:
-    if value == "":
-        return Ok(("cause_recode_358", None))
+    The field is read from its `split_fields` column, where blanks are already
+    null.
 
-    return Ok(("cause_recode_358", value))
+    Args:
+      name (str): The name of the field, as found in `mapping`.
 
+    Returns:
+      pl.Expr: The parsed value of the field, null when it is not a number.
 
-@propagate_result
-def process_cause_recode_113(
-    value: str,
-) -> Result[tuple[Literal["cause_recode_113"], Optional[str]], str]:
-    if value == "":
-        return Ok(("cause_recode_113", None))
+    """
+    _, length = fields[name]
+    return pl.col(name).cast(pl.Int8 if length <= 2 else pl.Int16, strict=False)
 
-    return Ok(("cause_recode_113", value))
 
+def map_codes(
+    name: str, m: Mapping[Any, Any], dtype: pl.PolarsDataType | None = None
+) -> pl.Expr:
+    """
+    Maps the codes of a field to their values.
 
-@propagate_result
-def process_infant_cause_recode_130(
-    value: str,
-) -> Result[tuple[Literal["infant_cause_recode_130"], Optional[str]], str]:
-    if value == "":
-        return Ok(("infant_cause_recode_130", None))
+    The codes are looked up in a table holding the value of every code the
+    field can take. Numeric codes index the table directly, and single uppercase
+    letter codes once read as base 36 digits.
 
-    return Ok(("infant_cause_recode_130", value))
+    Args:
+      name (str): The name of the field, as found in `mapping`.
+      m (Mapping[Any, Any]): The values of the codes.
+      dtype (pl.PolarsDataType, optional): The type of the values. When it is an
+        enum, the codes are mapped straight to the index of their value in it,
+        so that the values never have to be built and hashed as strings.
 
+    Returns:
+      pl.Expr: The values of the field, null for unknown codes.
 
-@propagate_result
-def process_cause_recode_39(
-    value: str,
-) -> Result[tuple[Literal["cause_recode_39"], Optional[int]], str]:
-    if value == "":
-        return Ok(("cause_recode_39", None))
-
-    v = try_parse_int(value).up()
-    if 1 <= v <= 42:
-        return Ok(("cause_recode_39", v))
+    """
+    if isinstance(next(iter(m)), int):
+        _, length = fields[name]
+        v, table = code(name), [None] * 10**length
+        keys = {k: k for k in m}
     else:
-        return Ok(("cause_recode_39", None))
-
-
-@propagate_result
-def process_number_of_entity_axis_conditions(
-    value: str,
-) -> Result[tuple[Literal["number_of_entity_axis_conditions"], Optional[int]], str]:
-    if value == "":
-        return Ok(("number_of_entity_axis_conditions", None))
-
-    v = try_parse_int(value).up()
-    if 0 <= v <= 20:
-        return Ok(("number_of_entity_axis_conditions", v))
-    else:
-        return Err(f"Invalid value for number_of_entity_axis_conditions: {v}")
-
-
-@propagate_result
-def process_entity_axis_condition(
-    n: int,
-    value: str,
-) -> Result[tuple[str, Optional[dict[str, str | int]]], str]:
-    if value == "":
-        return Ok((f"entity_axis_condition_{n}", None))
-
-    part_line = try_parse_int(value[0]).up()
-    part = "PART_I" if part_line <= 5 else "PART_II"
-
-    certificate_line = try_parse_int(value[1]).up()
-
-    condition_code = value[2:]
-
-    return Ok(
-        (
-            f"entity_axis_condition_{n}",
-            {
-                "certificate_part": part,
-                "certificate_line": certificate_line,
-                "condition": condition_code,
-            },
+        f = pl.col(name)
+        # Base 36 digits are read regardless of case, while the codes are
+        # uppercase, so lowercase letters are left out of the lookup
+        v = pl.when(f.str.contains("^[0-9A-Z]$")).then(
+            f.str.to_integer(base=36, strict=False)
         )
-    )
-
-
-@propagate_result
-def process_number_of_record_axis_conditions(
-    value: str,
-) -> Result[tuple[Literal["number_of_record_axis_conditions"], Optional[int]], str]:
-    if value == "":
-        return Ok(("number_of_record_axis_conditions", None))
-
-    v = try_parse_int(value).up()
-    if 0 <= v <= 20:
-        return Ok(("number_of_record_axis_conditions", v))
-    else:
-        return Err(f"Invalid value for number_of_record_axis_conditions: {v}")
-
-
-@propagate_result
-def process_record_axis_condition(
-    n: int,
-    value: str,
-) -> Result[tuple[str, Optional[str]], str]:
-    if value == "":
-        return Ok((f"record_axis_condition_{n}", None))
-
-    return Ok((f"record_axis_condition_{n}", value))
+        table = [None] * 36
+        keys = {k: int(k, 36) for k in m}
+    if isinstance(dtype, pl.Enum):
+        categories = dtype.categories.to_list()
+        for k, c in m.items():
+            if c in categories:
+                table[keys[k]] = categories.index(c)
+        return look_up(v, pl.Series(table, dtype=pl.UInt32)).cast(dtype)
+    for k, value in m.items():
+        table[keys[k]] = value
+    return look_up(v, pl.Series(table, dtype=dtype))
+
 
+def look_up(v: pl.Expr, table: pl.Series) -> pl.Expr:
+    """
+    Looks codes up in a table indexed by code.
+
+    The fields are only a few characters wide, so a table holding every code
+    they can take is small, and looking a code up in it is a plain gather.
+
+    Args:
+      v (pl.Expr): The codes, as integers.
+      table (pl.Series): The value of every code, from 0 up.
+
+    Returns:
+      pl.Expr: The values of the codes, null for null or negative codes.
+
+    """
+    return pl.lit(table).gather(pl.when(v >= 0).then(v))
+
+
+def is_mapped(name: str, m: Mapping[Any, Any]) -> pl.Expr:
+    """
+    Checks that the codes of a field are known.
+
+    Args:
+      name (str): The name of the field, as found in `mapping`.
+      m (Mapping[Any, Any]): The values of the codes.
+
+    Returns:
+      pl.Expr: True for the codes found in the mapping, null for blank fields.
+
+    """
+    v = code(name) if isinstance(next(iter(m)), int) else pl.col(name)
+    return v.is_in(list(m))
+
+
+def decode_detail_age() -> pl.Expr:
+    """
+    Decodes the detail age, a unit followed by a count of that unit.
+
+    Returns:
+      pl.Expr: The age, in milliseconds, null when it is not stated.
+
+    """
+    # The unit and the count are the leading digit and the last three digits of
+    # the field, so it is parsed once and split arithmetically
+    v = code("detail_age")
+    based_on, count = v // 1000, v % 1000
+    units = [detail_age_unit_as_ms.get(unit) for unit in range(10)]
+    mult = look_up(based_on, pl.Series(units, dtype=pl.Int64))
+    return count * mult
+
+
+def decode_age_recode(
+    name: str, bounds: Mapping[int, tuple[int, int]]
+) -> tuple[pl.Expr, pl.Expr]:
+    """
+    Decodes an age recode into the range of ages it stands for.
+
+    Args:
+      name (str): The name of the field, as found in `mapping`.
+      bounds (Mapping[int, tuple[int, int]]): The lower and upper bounds of the
+        ages of each code, in milliseconds.
+
+    Returns:
+      tuple[pl.Expr, pl.Expr]: The lower and upper bounds of the age, null when
+        it is not stated.
+
+    """
+    low = map_codes(name, {k: low for k, (low, _) in bounds.items()}, pl.Int64)
+    upper = map_codes(name, {k: upper for k, (_, upper) in bounds.items()}, pl.Int64)
+    return low, upper
+
+
+def decode_age_bounds() -> tuple[pl.Expr, pl.Expr]:
+    """
+    Picks the most precise age available for each record.
+
+    The detail age is used when stated, falling back to the infant age recode
+    and then to the age recodes, from the most to the least precise.
+
+    Returns:
+      tuple[pl.Expr, pl.Expr]: The lower and upper bounds of the age, in milliseconds.
+
+    """
+    detail_age = decode_detail_age()
+    recodes = [
+        decode_age_recode("infant_age_recode_22", infant_age_recode_22_bounds),
+        decode_age_recode("age_recode_52", age_recode_52_bounds),
+        decode_age_recode("age_recode_27", age_recode_27_bounds),
+        decode_age_recode("age_recode_12", age_recode_12_bounds),
+    ]
+    low = pl.coalesce(detail_age, *(low for low, _ in recodes))
+    upper = pl.coalesce(detail_age, *(upper for _, upper in recodes))
+    return low.alias("age_lower_bound"), upper.alias("age_upper_bound")
 
-@propagate_result
-def process_race_imputation_flag(
-    value: str,
-) -> Result[tuple[Literal["race_imputation_flag"], bool], str]:
-    if value == "":
-        return Ok(("race_imputation_flag", False))
-
-    v = try_parse_int(value).up()
-    if v == 1 or v == 2:
-        return Ok(("race_imputation_flag", True))
-    else:
-        return Err(f"Invalid value for race_imputation_flag: {v}")
-
 
-@propagate_result
-def process_race_recode_6(
-    value: str,
-) -> Result[tuple[Literal["race_recode_6"], Optional[str]], str]:
-    if value == "":
-        return Ok(("race_recode_6", None))
-
-    v = try_parse_int(value).up()
-    mapped = race_recode_6_mapping.get(v)
-    if mapped:
-        return Ok(("race_recode_6", mapped))
-    else:
-        return Err(f"Invalid value for race_recode_6: {v}")
+def decode_entity_axis_conditions() -> tuple[pl.Expr, pl.Expr, pl.Expr]:
+    """
+    Splits the entity axis conditions into their position on the certificate
+    and their code.
 
+    Returns:
+      tuple[pl.Expr, pl.Expr, pl.Expr]: The certificate part, the certificate
+        line and the code of the conditions, as parallel lists.
 
-@propagate_result
-def process_hispanic_origin(
-    value: str,
-) -> Result[tuple[Literal["hispanic_origin"], Optional[str]], str]:
-    if value == "":
-        return Ok(("hispanic_origin", None))
-
-    v = try_parse_int(value).up()
-    mapped = get_in_range(hispanic_origin_mapping, v)
-    if mapped or range_keyed_dict_has_key(hispanic_origin_mapping, v):
-        return Ok(("hispanic_origin", mapped))
-    else:
-        return Err(f"Invalid value for hispanic_origin: {v}")
-
-
-@propagate_result
-def process_hispanic_origin_race_recode(
-    value: str,
-) -> Result[tuple[Literal["hispanic_origin_race_recode"], Optional[str]], str]:
-    if value == "":
-        return Ok(("hispanic_origin_race_recode", None))
-
-    v = try_parse_int(value).up()
-    mapped = hispanic_origin_race_recode_mapping.get(v)
-
-    if mapped or v in hispanic_origin_race_recode_mapping:
-        return Ok(("hispanic_origin_race_recode", mapped))
-    else:
-        return Err(f"Invalid value for hispanic_origin_race_recode: {v}")
-
-
-@propagate_result
-def process_race_recode_40(
-    value: str,
-) -> Result[tuple[Literal["race_recode_40"], Optional[list[str]]], str]:
-    if value == "":
-        return Ok(("race_recode_40", None))
-
-    v = try_parse_int(value).up()
-    mapped = race_recode_40_mapping.get(v)
-
-    if mapped:
-        if v <= 14:
-            return Ok(("race_recode_40", [mapped]))
-        else:
-            parts = mapped.split("_")
-            for part in parts:
-                if part == "ASIAN":
-                    part = "OTHER_ASIAN"
-                elif part == "NHOPI":
-                    part = "OTHER_PACIFIC_ISLANDER"
-            return Ok(("race_recode_40", parts))
-    else:
-        return Err(f"Invalid value for race_recode_40: {v}")
-
-
-@propagate_result
-def process_decedent_occupation_code(
-    value: str,
-) -> Result[tuple[Literal["decedent_occupation_code"], Optional[str]], str]:
-    if value == "":
-        return Ok(("decedent_occupation_code", None))
+    """
+    conditions = pl.col("entity_axis_condition")
+    value = pl.element()
+    # The part/line number and the sequence within it are the two leading
+    # digits of a condition, so they are parsed at once and split arithmetically
+    position = value.str.slice(0, 2).cast(pl.UInt8, strict=False)
+    part_line, certificate_line = position // 10, position % 10
+    certificate_part = (
+        pl.when(part_line <= 5).then(pl.lit("PART_I")).otherwise(pl.lit("PART_II"))
+    )
+    return (
+        conditions.list.eval(certificate_part).alias("entity_axis_certificate_parts"),
+        conditions.list.eval(certificate_line).alias("entity_axis_certificate_lines"),
+        conditions.list.eval(value.str.slice(2)).alias("entity_axis_conditions"),
+    )
 
-    return Ok(("decedent_occupation_code", value))
 
+def decode_hispanic_origin() -> pl.Expr:
+    """
+    Decodes the hispanic origin, whose codes stand for ranges of origins.
 
-@propagate_result
-def process_decedent_occupation_recode(
-    value: str,
-) -> Result[tuple[Literal["decedent_occupation_recode"], Optional[str]], str]:
-    if value == "":
-        return Ok(("decedent_occupation_recode", None))
-
-    v = try_parse_int(value).up()
-    mapped = decedent_occupation_recode_mapping.get(v)
-    if mapped or v in decedent_occupation_recode_mapping.keys():
-        return Ok(("decedent_occupation_recode", mapped))
-    else:
-        return Err(f"Invalid value for decedent_occupation_recode: {v}")
+    Returns:
+      pl.Expr: The hispanic origin, null for unknown codes.
 
+    """
+    _, length = fields["hispanic_origin"]
+    dtype = dataset_schema["hispanic_origin"]
+    categories = dtype.categories.to_list()  # type: ignore
+    # Every code the field can hold is looked up in a table of the index of its
+    # value among the categories of the enum
+    table = range_keyed_dict_to_table(hispanic_origin_mapping, 10**length)
+    indexes = pl.Series(
+        [None if value is None else categories.index(value) for value in table],
+        dtype=pl.UInt32,
+    )
+    return look_up(code("hispanic_origin"), indexes).cast(dtype)
+
+
+def decode_race_recode_40() -> pl.Expr:
+    """
+    Decodes the race recode 40 into the list of races it is made of.
+
+    Single races are stored as a list of one race, and multiple races as a list
+    of their components.
+
+    Returns:
+      pl.Expr: The races, null for unknown codes.
+
+    """
+    _, length = fields["race_recode_40"]
+    # The list of every code the field can hold is built once, and looked up in
+    # a table. The combinations name the Asian and Pacific Islander groups as a
+    # whole, which stand for the "other or multiple" members of the single races
+    parts = {"ASIAN": "OTHER_ASIAN", "NHOPI": "OTHER_PACIFIC_ISLANDER"}
+    table: list[Optional[list[str]]] = [None] * 10**length
+    for k, value in race_recode_40_mapping.items():
+        components = [value] if k <= 14 else value.split("_")
+        table[k] = [parts.get(race, race) for race in components]
+    races = pl.Series(table, dtype=dataset_schema["race_recode_40"])
+    return look_up(code("race_recode_40"), races)
+
+
+def decoders() -> dict[str, pl.Expr]:
+    """
+    Builds the expression decoding each column of the dataset.
+
+    Returns:
+      dict[str, pl.Expr]: The expressions, keyed by column name.
+
+    """
+    age_lower_bound, age_upper_bound = decode_age_bounds()
+    (
+        entity_axis_certificate_parts,
+        entity_axis_certificate_lines,
+        entity_axis_conditions,
+    ) = decode_entity_axis_conditions()
+    v_cause_recode_39 = code("cause_recode_39")
+    return {
+        "record_type": map_codes(
+            "record_type", record_type_mapping, dataset_schema["record_type"]
+        ),
+        "resident_status": map_codes(
+            "resident_status",
+            resident_status_mapping,
+            dataset_schema["resident_status"],
+        ),
+        "education": map_codes(
+            "education", education_mapping, dataset_schema["education"]
+        ),
+        "month_of_death": code("month_of_death").cast(pl.UInt8, strict=False),
+        "sex": map_codes("sex", sex_mapping, dataset_schema["sex"]),
+        "place_of_death": map_codes(
+            "place_of_death_and_decedents_status",
+            place_of_death_mapping,
+            dataset_schema["place_of_death"],
+        ),
+        "marital_status": map_codes(
+            "marital_status", marital_status_mapping, dataset_schema["marital_status"]
+        ),
+        "day_of_week_of_death": map_codes(
+            "day_of_week_of_death",
+            day_of_week_of_death_mapping,
+            dataset_schema["day_of_week_of_death"],
+        ),
+        "injury_at_work": map_codes("injury_at_work", injury_at_work_mapping),
+        "manner_of_death": map_codes(
+            "manner_of_death",
+            manner_of_death_mapping,
+            dataset_schema["manner_of_death"],
+        ),
+        "method_of_disposition": map_codes(
+            "method_of_disposition",
+            method_of_disposition_mapping,
+            dataset_schema["method_of_disposition"],
+        ),
+        "autopsy": map_codes("autopsy", autopsy_mapping),
+        "activity_code": map_codes(
+            "activity_code", activity_code_mapping, dataset_schema["activity_code"]
+        ),
+        "place_of_injury": map_codes(
+            "place_of_injury",
+            place_of_injury_mapping,
+            dataset_schema["place_of_injury"],
+        ),
+        "icd_code": pl.col("icd_code"),
+        "cause_recode_358": pl.col("cause_recode_358"),
+        "cause_recode_113": pl.col("cause_recode_113"),
+        "infant_cause_recode_130": pl.col("infant_cause_recode_130"),
+        "cause_recode_39": pl.when(v_cause_recode_39.is_between(1, 42)).then(
+            v_cause_recode_39
+        ),
+        "race_recode_6": map_codes(
+            "race_recode_6", race_recode_6_mapping, dataset_schema["race_recode_6"]
+        ),
+        "hispanic_origin": decode_hispanic_origin(),
+        "hispanic_origin_race_recode": map_codes(
+            "hispanic_origin_race_recode",
+            hispanic_origin_race_recode_mapping,
+            dataset_schema["hispanic_origin_race_recode"],
+        ),
+        "race_recode_40": decode_race_recode_40(),
+        "decedent_occupation_code": pl.col(
+            "decedents_usual_occindu_occupation_4_digit_code"
+        ),
+        "decedent_occupation_recode": map_codes(
+            "decedents_usual_occindu_occupation_recode",
+            decedent_occupation_recode_mapping,
+            dataset_schema["decedent_occupation_recode"],
+        ),
+        "decedent_industry_code": pl.col(
+            "decedents_usual_occindu_industry_4_digit_code"
+        ),
+        "decedent_industry_recode": map_codes(
+            "decedents_usual_occindu_industry_recode",
+            decedent_industry_recode_mapping,
+            dataset_schema["decedent_industry_recode"],
+        ),
+        "age_lower_bound": age_lower_bound,
+        "age_upper_bound": age_upper_bound,
+        "entity_axis_certificate_parts": entity_axis_certificate_parts,
+        "entity_axis_certificate_lines": entity_axis_certificate_lines,
+        "entity_axis_conditions": entity_axis_conditions,
+        "record_axis_conditions": pl.col("record_axis_condition"),
+    }
+
+
+def validators() -> dict[str, tuple[pl.Expr, pl.Expr]]:
+    """
+    Builds the expression checking the values of each field.
+
+    Returns:
+      dict[str, tuple[pl.Expr, pl.Expr]]: The value of each field and the
+        expression checking it, keyed by field name. Each check is true when
+        the value is valid, blank values always being valid.
+
+    """
+    field_checks = {
+        "record_type": is_mapped("record_type", record_type_mapping),
+        "resident_status": is_mapped("resident_status", resident_status_mapping),
+        "education": is_mapped("education", education_mapping),
+        "education_reporting_flag": is_mapped(
+            "education_reporting_flag", education_reporting_flag_mapping
+        ),
+        "month_of_death": code("month_of_death").is_between(1, 12),
+        "sex": is_mapped("sex", sex_mapping),
+        "detail_age": pl.col("detail_age").str.contains(r"^\d\d+$"),
+        "age_substitution_flag": code("age_substitution_flag") == 1,
+        "age_recode_52": code("age_recode_52").is_between(1, 52),
+        "age_recode_27": code("age_recode_27").is_between(1, 27),
+        "age_recode_12": code("age_recode_12").is_between(1, 12),
+        "infant_age_recode_22": code("infant_age_recode_22").is_between(1, 22),
+        "place_of_death_and_decedents_status": is_mapped(
+            "place_of_death_and_decedents_status", place_of_death_mapping
+        ),
+        "marital_status": is_mapped("marital_status", marital_status_mapping),
+        "day_of_week_of_death": is_mapped(
+            "day_of_week_of_death", day_of_week_of_death_mapping
+        ),
+        "injury_at_work": is_mapped("injury_at_work", injury_at_work_mapping),
+        "manner_of_death": is_mapped("manner_of_death", manner_of_death_mapping),
+        "method_of_disposition": is_mapped(
+            "method_of_disposition", method_of_disposition_mapping
+        ),
+        "autopsy": is_mapped("autopsy", autopsy_mapping),
+        "activity_code": is_mapped("activity_code", activity_code_mapping),
+        "place_of_injury": is_mapped("place_of_injury", place_of_injury_mapping),
+        "cause_recode_39": code("cause_recode_39").is_not_null(),
+        "number_of_entity_axis_conditions": code(
+            "number_of_entity_axis_conditions"
+        ).is_between(0, 20),
+        "number_of_record_axis_conditions": code(
+            "number_of_record_axis_conditions"
+        ).is_between(0, 20),
+        "race_imputation_flag": code("race_imputation_flag").is_in([1, 2]),
+        "race_recode_6": is_mapped("race_recode_6", race_recode_6_mapping),
+        "hispanic_origin": pl.any_horizontal(
+            code("hispanic_origin").is_between(start, end)
+            for start, end in hispanic_origin_ranges
+        ),
+        "hispanic_origin_race_recode": is_mapped(
+            "hispanic_origin_race_recode", hispanic_origin_race_recode_mapping
+        ),
+        "race_recode_40": is_mapped("race_recode_40", race_recode_40_mapping),
+        "decedents_usual_occindu_occupation_recode": is_mapped(
+            "decedents_usual_occindu_occupation_recode",
+            decedent_occupation_recode_mapping,
+        ),
+        "decedents_usual_occindu_industry_recode": is_mapped(
+            "decedents_usual_occindu_industry_recode",
+            decedent_industry_recode_mapping,
+        ),
+    }
+    checks = {name: (pl.col(name), check) for name, check in field_checks.items()}
+    # The entity axis conditions are checked at once, on the list of them that
+    # is also decoded, rather than sliced out of the records one by one. The
+    # first condition that fails is the one reported
+    conditions = pl.col("entity_axis_condition")
+    is_condition = pl.element().str.contains(r"^\d\d")
+    checks["entity_axis_conditions"] = (
+        conditions.list.eval(pl.element().filter(~is_condition)).list.first(),
+        conditions.list.eval(is_condition).list.all(),
+    )
+    return checks
 
-@propagate_result
-def process_decedent_industry_code(
-    value: str,
-) -> Result[tuple[Literal["decedent_industry_code"], Optional[str]], str]:
-    if value == "":
-        return Ok(("decedent_industry_code", None))
 
-    return Ok(("decedent_industry_code", value))
+def is_valid() -> pl.Expr:
+    """
+    Checks that every field of a record holds a known value.
 
+    Returns:
+      pl.Expr: True for the records whose fields are all either valid or blank.
 
-@propagate_result
-def process_decedent_industry_recode(
-    value: str,
-) -> Result[tuple[Literal["decedent_industry_recode"], Optional[str]], str]:
-    if value == "":
-        return Ok(("decedent_industry_recode", None))
-
-    v = try_parse_int(value).up()
-    mapped = decedent_industry_recode_mapping.get(v)
-    if mapped or v in decedent_industry_recode_mapping.keys():
-        return Ok(("decedent_industry_recode", mapped))
-    else:
-        return Err(f"Invalid value for decedent_industry_recode: {v}")
+    """
+    return pl.all_horizontal(
+        value.is_null() | check.fill_null(False)
+        for value, check in validators().values()
+    )
 
 
-@propagate_result
-def process_line(line: str) -> Result[OrderedDict[str, Any], str]:
-    d = OrderedDict()
-    for (start, end), field in mapping.items():
-        value = line[start - 1 : end].strip()
-        if field == "reserved_positions":
-            continue
-        elif field == "record_type":
-            k, v = process_record_type(value).up()
-            d[k] = v
-        elif field == "resident_status":
-            k, v = process_resident_status(value).up()
-            d[k] = v
-        elif field == "education":
-            k, v = process_education(value).up()
-            d[k] = v
-        elif field == "education_reporting_flag":
-            k, v = process_education_reporting_flag(value).up()
-        elif field == "month_of_death":
-            k, v = process_month_of_death(value).up()
-            d[k] = v
-        elif field == "sex":
-            k, v = process_sex(value).up()
-            d[k] = v
-        elif field == "detail_age":
-            k, v = process_detail_age(value).up()
-            d[k] = v
-        elif field == "age_substitution_flag":
-            k, v = process_age_substitution_flag(value).up()
-            d[k] = v
-        elif field == "age_recode_52":
-            k, v = process_age_recode_52(value).up()
-            d[k] = v
-        elif field == "age_recode_27":
-            k, v = process_age_recode_27(value).up()
-            d[k] = v
-        elif field == "age_recode_12":
-            k, v = process_age_recode_12(value).up()
-            d[k] = v
-        elif field == "infant_age_recode_22":
-            k, v = process_infant_age_recode_22(value).up()
-            d[k] = v
-        elif field == "place_of_death_and_decedents_status":
-            k, v = process_place_of_death(value).up()
-            d[k] = v
-        elif field == "marital_status":
-            k, v = process_marital_status(value).up()
-            d[k] = v
-        elif field == "day_of_week_of_death":
-            k, v = process_day_of_week_of_death(value).up()
-            d[k] = v
-        elif field == "injury_at_work":
-            k, v = process_injury_at_work(value).up()
-            d[k] = v
-        elif field == "manner_of_death":
-            k, v = process_manner_of_death(value).up()
-            d[k] = v
-        elif field == "method_of_disposition":
-            k, v = process_method_of_disposition(value).up()
-            d[k] = v
-        elif field == "autopsy":
-            k, v = process_autopsy(value).up()
-            d[k] = v
-        elif field == "activity_code":
-            k, v = process_activity_code(value).up()
-            d[k] = v
-        elif field == "place_of_injury":
-            k, v = process_place_of_injury(value).up()
-            d[k] = v
-        elif field == "icd_code":
-            k, v = process_icd_code(value).up()
-            d[k] = v
-        elif field == "cause_recode_358":
-            k, v = process_cause_recode_358(value).up()
-            d[k] = v
-        elif field == "cause_recode_113":
-            k, v = process_cause_recode_113(value).up()
-            d[k] = v
-        elif field == "infant_cause_recode_130":
-            k, v = process_infant_cause_recode_130(value).up()
-            d[k] = v
-        elif field == "cause_recode_39":
-            k, v = process_cause_recode_39(value).up()
-            d[k] = v
-        elif field == "number_of_entity_axis_conditions":
-            k, v = process_number_of_entity_axis_conditions(value).up()
-            d[k] = v
-        elif field.startswith("entity_axis_condition_"):
-            n = int(field.split("_")[-1])
-            k, v = process_entity_axis_condition(n, value).up()
-            d[k] = v
-        elif field == "number_of_record_axis_conditions":
-            k, v = process_number_of_record_axis_conditions(value).up()
-            d[k] = v
-        elif field.startswith("record_axis_condition_"):
-            n = int(field.split("_")[-1])
-            k, v = process_record_axis_condition(n, value).up()
-            d[k] = v
-        elif field == "race_imputation_flag":
-            k, v = process_race_imputation_flag(value).up()
-            d[k] = v
-        elif field == "race_recode_6":
-            k, v = process_race_recode_6(value).up()
-            d[k] = v
-        elif field == "hispanic_origin":
-            k, v = process_hispanic_origin(value).up()
-            d[k] = v
-        elif field == "hispanic_origin_race_recode":
-            k, v = process_hispanic_origin_race_recode(value).up()
-            d[k] = v
-        elif field == "race_recode_40":
-            k, v = process_race_recode_40(value).up()
-            d[k] = v
-        elif field == "decedents_usual_occindu_occupation_4_digit_code":
-            k, v = process_decedent_occupation_code(value).up()
-            d[k] = v
-        elif field == "decedents_usual_occindu_occupation_recode":
-            k, v = process_decedent_occupation_recode(value).up()
-            d[k] = v
-        elif field == "decedents_usual_occindu_industry_4_digit_code":
-            k, v = process_decedent_industry_code(value).up()
-            d[k] = v
-        elif field == "decedents_usual_occindu_industry_recode":
-            k, v = process_decedent_industry_recode(value).up()
-            d[k] = v
-
-    return Ok(d)
-
-
-def load_file(path: Path) -> list[str]:
+def load_file(path: Path) -> pl.DataFrame:
     rlines_task = progress.add_task(
         "> Pulling lines from file, this may take a while", total=None
     )
-    with open(path, "r") as f:
-        lines = f.readlines()
+    # Polars memory-maps the file when given its path, so the records never go
+    # through Python. It skips the whitespace at the start of a file though,
+    # which would eat the blank reserved positions of the first record, so that
+    # one is read on its own from a memory map of the file.
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        end = mm.find(b"\n")
+        first_line = mm[: end if end != -1 else len(mm)].rstrip(b"\r").decode()
+        # A file holding a single record has no lines left to read after it
+        has_more_lines = end != -1 and end + 1 < len(mm)
+
+    lines = pl.DataFrame({"raw": [first_line]}, schema={"raw": pl.Utf8})
+    if has_more_lines:
+        lines = pl.concat(
+            [
+                lines,
+                pl.read_csv(
+                    path,
+                    has_header=False,
+                    separator="\x00",
+                    quote_char=None,
+                    skip_rows=1,
+                    new_columns=["raw"],
+                    schema={"raw": pl.Utf8},
+                    rechunk=False,
+                ),
+            ],
+            rechunk=False,
+        )
 
     progress.remove_task(rlines_task)
     return lines
 
 
 @propagate_result
-def parallel_process_lines(
-    path: Path,
-) -> Result[pl.DataFrame, str]:
-    lines = load_file(path)
+def validate_fields(lines: pl.LazyFrame) -> Result[None, str]:
+    """
+    Checks that every field of every record holds a known value.
 
-    # Evenly distribute the lines to each process
-    lines_per_process = len(lines) // MAX_PARALLEL_PROCESSING
-    lines_per_process = max(1, lines_per_process)
+    Args:
+      lines (pl.LazyFrame): The records, split into their fields by `split_fields`.
 
-    # Split the lines into batches
-    batches = []
-    for i in range(0, len(lines), lines_per_process):
-        batch = lines[i : i + lines_per_process]
-        batches.append(batch)
+    Returns:
+      Result[None, str]: An error message naming every invalid field, along with
+        its first invalid value.
 
-    print(f"Processing {len(lines)} lines in {len(batches)} batches")
-    print(f"{MAX_PARALLEL_PROCESSING} parallel processes will be used")
+    """
+    first_invalid = lines.select(
+        value.filter(value.is_not_null() & ~check.fill_null(False)).first().alias(name)
+        for name, (value, check) in validators().items()
+    ).collect()
 
-    futures: list[
-        tuple[Future[Result[pl.DataFrame, str]], TaskID]
-    ] = []  # keep track of the jobs
-
-    with multiprocessing.Manager() as manager:
-        _progress = manager.dict()
-        overall_progress_task = progress.add_task(
-            "> Processing lines", total=len(lines)
-        )
-
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=MAX_PARALLEL_PROCESSING
-        ) as pool:
-            for i, batch in enumerate(batches):
-                batch_task = progress.add_task(
-                    f"> > Processing batch {i + 1}", total=len(batch)
-                )
-                future = pool.submit(process_lines_batch, batch, _progress, batch_task)
-                futures.append((future, batch_task))
-
-            # monitor the progress:
-            while (n_finished := sum([future.done() for future, _ in futures])) < len(
-                futures
-            ):
-                progress.update(
-                    overall_progress_task, completed=n_finished, total=len(futures)
-                )
-                for task_id, update_data in _progress.items():
-                    latest = update_data["progress"]
-                    total = update_data["total"]
-                    # update the progress bar for this task:
-                    progress.update(
-                        task_id,
-                        completed=latest,
-                        total=total,
-                        visible=latest < total,
-                    )
-
-            results = [future.result() for future, _ in futures]
-
-    results = [r.up() for r in results]
-    df = pl.concat(results).cast(dataset_schema)  # type: ignore
-
-    return Ok(df)
+    errors = [
+        f"Invalid value for {name}: {value}"
+        for name, value in first_invalid.row(0, named=True).items()
+        if value is not None
+    ]
+    return Err("\n".join(errors)) if errors else Ok(None)
 
 
 @propagate_result
-def process_lines_batch(
-    lines: list[str], progress: DictProxy, task_id: TaskID
-) -> Result[pl.DataFrame, str]:
-    n = 0
-
-    temp = []
-    for line in lines:
-        n += 1
-        progress[task_id] = {"progress": n, "total": len(lines)}
-
-        processed_line = process_line(line).up()
-        #
-        # Age
-        final_age: int | tuple[int, int] | None = (
-            processed_line.get("detail_age")
-            or processed_line.get("infant_age_recode_22")
-            or processed_line.get("age_recode_52")
-            or processed_line.get("age_recode_27")
-            or processed_line.get("age_recode_12")
-            or None
-        )
-        age_lower_bound = None
-        age_upper_bound = None
-        if (
-            final_age
-            and isinstance(final_age, tuple)
-            and all(isinstance(i, int) for i in final_age)
-        ):
-            age_lower_bound, age_upper_bound = final_age
-        elif final_age and isinstance(final_age, int):
-            age_lower_bound = final_age
-            age_upper_bound = final_age
-        #
-        # Entity Axis Conditions
-        entity_axis_conditions = []
-        for i in range(1, 21):
-            entity_axis_condition = processed_line.get(f"entity_axis_condition_{i}")
-            if entity_axis_condition:
-                entity_axis_conditions.append(entity_axis_condition)
-        #
-        # Record Axis Conditions
-        record_axis_conditions = []
-        for i in range(1, 21):
-            record_axis_condition = processed_line.get(f"record_axis_condition_{i}")
-            if record_axis_condition:
-                record_axis_conditions.append(record_axis_condition)
-        #
-        # Remove unneeded fields
-        for k in list(processed_line.keys()):
-            if k.startswith("entity_axis_condition_") or k.startswith(
-                "record_axis_condition_"
-            ):
-                maybe_del(processed_line, k)
-
-        maybe_del(processed_line, "detail_age")
-        maybe_del(processed_line, "infant_age_recode_22")
-        maybe_del(processed_line, "age_recode_52")
-        maybe_del(processed_line, "age_recode_27")
-        maybe_del(processed_line, "age_recode_12")
-        maybe_del(processed_line, "education_reporting_flag")
-        maybe_del(processed_line, "age_substitution_flag")
-        maybe_del(processed_line, "number_of_entity_axis_conditions")
-        maybe_del(processed_line, "number_of_record_axis_conditions")
-        maybe_del(processed_line, "race_imputation_flag")
-        #
-        # Combine all the processed fields
-        row = {
-            **processed_line,
-            "age_lower_bound": age_lower_bound,
-            "age_upper_bound": age_upper_bound,
-            "entity_axis_conditions": entity_axis_conditions,
-            "record_axis_conditions": record_axis_conditions,
-        }
-        temp.append(row)
-
-    df = pl.DataFrame(data=temp, infer_schema_length=None)
-    return Ok(df)
+def process_lines(path: Path) -> Result[pl.DataFrame, str]:
+    lines = load_file(path)
+    print(f"Processing {len(lines)} lines")
+
+    # The records are validated in the same query that decodes them, so that
+    # each field is sliced out of the records once for both. The records are
+    # split into chunks that are decoded in parallel.
+    decode_task = progress.add_task("> Decoding and validating fields", total=None)
+    n_chunks = min(MAX_PARALLEL_PROCESSING * 4, CHUNK_FIELDS_BUDGET // len(fields))
+    chunk_size = max(-(-len(lines) // n_chunks), 1)
+    # The expressions are built once for the dataset layout, and shared by the
+    # queries of all the chunks
+    columns = [
+        *(expr.alias(name) for name, expr in decoders().items()),
+        is_valid().alias("is_valid"),
+    ]
+    chunks = [
+        split_fields(lines.slice(offset, chunk_size).lazy())
+        .select(columns)
+        .cast(dataset_schema)  # type: ignore
+        for offset in range(0, len(lines), chunk_size)
+    ]
+    # The chunks are cast to the dataset schema as they are decoded, sharing a
+    # single pool of categories, so that they are concatenated without merging
+    # their categories. The records are only ever sliced, so neither them nor
+    # the decoded chunks are copied into contiguous memory
+    with pl.StringCache():
+        df = pl.concat(pl.collect_all(chunks), rechunk=False)
+    progress.remove_task(decode_task)
+
+    if not df["is_valid"].all():
+        validate_fields(split_fields(lines.filter(~df["is_valid"]).lazy())).up()
+
+    return Ok(df.drop("is_valid"))
 
 
 if __name__ == "__main__":
@@ -1498,5 +1273,5 @@ if __name__ == "__main__":
         progress = p
 
         task = progress.add_task("[red]Processing dataset...", limit=None)
-        df = parallel_process_lines(DATASET_PATH).unwrap()
+        df = process_lines(DATASET_PATH).unwrap()
         df.write_parquet(OUTPUT_PATH)
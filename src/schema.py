@@ -1,10 +1,25 @@
 from collections.abc import Mapping
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Final, Optional
 import polars as pl
 
 
+def enum_of(m: Mapping[Any, Optional[str]]) -> pl.Enum:
+    """
+    Builds the enum of the values of a mapping.
+
+    Args:
+      m (Mapping[Any, Optional[str]]): The mapping of codes to values.
+
+    Returns:
+      pl.Enum: The enum of the distinct values, in order, leaving out None.
+
+    """
+    return pl.Enum(tuple(dict.fromkeys(v for v in m.values() if v is not None)))
+
+
 record_type_mapping = {1: "RESIDENTS", 2: "NONRESIDENTS"}
-record_type = pl.Enum([v for v in record_type_mapping.values()])
+record_type = enum_of(record_type_mapping)
 #
 # -----------------------------------
 #
@@ -14,7 +29,7 @@ resident_status_mapping = {
     3: "INTERSTATE_NONRESIDENT",
     4: "FOREIGN_RESIDENT",
 }
-resident_status = pl.Enum([v for v in resident_status_mapping.values()])
+resident_status = enum_of(resident_status_mapping)
 #
 # -----------------------------------
 #
@@ -29,7 +44,7 @@ education_mapping = {
     8: "DOCTORATE_DEGREE_OR_PROFESSIONAL_DEGREE",
     9: None,
 }
-education = pl.Enum([v for v in education_mapping.values() if v is not None])
+education = enum_of(education_mapping)
 #
 # -----------------------------------
 #
@@ -37,18 +52,16 @@ education_reporting_flag_mapping = {
     1: "2003_REVISION",
     2: "NO_EDUCATION_ITEM_ON_CERTIFICATE",
 }
-education_reporting_flag = pl.Enum(
-    [v for v in education_reporting_flag_mapping.values()]
-)
+education_reporting_flag = enum_of(education_reporting_flag_mapping)
 #
 # -----------------------------------
 #
-month_of_death = pl.Int8()
+month_of_death = pl.UInt8()
 #
 # -----------------------------------
 #
 sex_mapping = {"M": "M", "F": "F"}
-sex = pl.Enum([v for v in sex_mapping.values()])
+sex = enum_of(sex_mapping)
 #
 # -----------------------------------
 #
@@ -67,7 +80,7 @@ place_of_death_mapping = {
     7: "OTHER",
     9: None,
 }
-place_of_death = pl.Enum([v for v in place_of_death_mapping.values() if v is not None])
+place_of_death = enum_of(place_of_death_mapping)
 #
 # -----------------------------------
 #
@@ -78,7 +91,7 @@ marital_status_mapping = {
     "D": "DIVORCED",
     "U": None,
 }
-marital_status = pl.Enum([v for v in marital_status_mapping.values() if v is not None])
+marital_status = enum_of(marital_status_mapping)
 #
 # -----------------------------------
 #
@@ -92,9 +105,7 @@ day_of_week_of_death_mapping = {
     7: "SATURDAY",
     9: None,
 }
-day_of_week_of_death = pl.Enum(
-    [v for v in day_of_week_of_death_mapping.values() if v is not None]
-)
+day_of_week_of_death = enum_of(day_of_week_of_death_mapping)
 #
 # -----------------------------------
 #
@@ -112,7 +123,7 @@ manner_of_death_mapping = {
     6: "SELF_INFLICTED",
     7: "NATURAL",
 }
-manner_of_death = pl.Enum([v for v in manner_of_death_mapping.values()])
+manner_of_death = enum_of(manner_of_death_mapping)
 #
 # -----------------------------------
 #
@@ -125,9 +136,7 @@ method_of_disposition_mapping = {
     "R": "REMOVAL_FROM_JURISDICTION",
     "U": None,
 }
-method_of_disposition = pl.Enum(
-    [v for v in method_of_disposition_mapping.values() if v is not None]
-)
+method_of_disposition = enum_of(method_of_disposition_mapping)
 #
 # -----------------------------------
 #
@@ -145,7 +154,7 @@ activity_code_mapping = {
     8: None,
     9: None,
 }
-activity_code = pl.Enum([v for v in activity_code_mapping.values() if v is not None])
+activity_code = enum_of(activity_code_mapping)
 #
 # -----------------------------------
 #
@@ -161,9 +170,7 @@ place_of_injury_mapping = {
     8: None,
     9: None,
 }
-place_of_injury = pl.Enum(
-    [v for v in place_of_injury_mapping.values() if v is not None]
-)
+place_of_injury = enum_of(place_of_injury_mapping)
 #
 # -----------------------------------
 #
@@ -183,21 +190,16 @@ infant_cause_recode_130 = pl.Categorical()
 #
 # -----------------------------------
 #
-cause_recode_39 = pl.Int8()
+cause_recode_39 = pl.UInt8()
 
 
 #
 # -----------------------------------
 #
 certificate_part = pl.Enum(["PART_I", "PART_II"])
-entity_axis_condition = pl.Struct(
-    {
-        "certificate_part": pl.Categorical(),
-        "certificate_line": pl.Int8(),
-        "condition": pl.Categorical(),
-    }
-)
-entity_axis_conditions = pl.List(inner=entity_axis_condition)
+entity_axis_certificate_parts = pl.List(inner=certificate_part)
+entity_axis_certificate_lines = pl.List(inner=pl.UInt8())
+entity_axis_conditions = pl.List(inner=pl.Categorical())
 #
 # -----------------------------------
 #
@@ -213,7 +215,7 @@ race_recode_6_mapping = {
     5: "NATIVE_HAWAIIAN_AND_OTHER_PACIFIC_ISLANDER",
     6: "MORE_THAN_ONE_R",
 }
-race_recode_6 = pl.Enum([v for v in race_recode_6_mapping.values()])
+race_recode_6 = enum_of(race_recode_6_mapping)
 #
 # -----------------------------------
 #
@@ -230,9 +232,7 @@ hispanic_origin_mapping: dict[tuple[int, int], Optional[str]] = {
     (280, 299): "OTHER_HISPANIC",
     (996, 999): None,
 }
-hispanic_origin = pl.Enum(
-    [v for v in hispanic_origin_mapping.values() if v is not None]
-)
+hispanic_origin = enum_of(hispanic_origin_mapping)
 #
 # -----------------------------------
 #
@@ -252,9 +252,7 @@ hispanic_origin_race_recode_mapping = {
     13: "NON_HISPANIC_MORE_THAN_ONE_R",
     14: None,
 }
-hispanic_origin_race_recode = pl.Enum(
-    [v for v in hispanic_origin_race_recode_mapping.values() if v is not None]
-)
+hispanic_origin_race_recode = enum_of(hispanic_origin_race_recode_mapping)
 #
 # -----------------------------------
 #
@@ -337,9 +335,7 @@ decedent_occupation_recode_mapping = {
     25: None,
     26: "HOUSEWIFE",
 }
-decedent_occupation_recode = pl.Enum(
-    [v for v in decedent_occupation_recode_mapping.values() if v is not None]
-)
+decedent_occupation_recode = enum_of(decedent_occupation_recode_mapping)
 #
 # -----------------------------------
 #
@@ -371,43 +367,45 @@ decedent_industry_recode_mapping = {
     22: "MILITARY",
     23: None,
 }
-decedent_industry_recode = pl.Enum(
-    [v for v in decedent_industry_recode_mapping.values() if v is not None]
-)
+decedent_industry_recode = enum_of(decedent_industry_recode_mapping)
 #
 # -----------------------------------
 # -----------------------------------
 #
-dataset_schema: Mapping[str, pl.PolarsDataType] = {
-    "record_type": record_type,
-    "resident_status": resident_status,
-    "education": education,
-    "month_of_death": month_of_death,
-    "sex": sex,
-    "age_lower_bound": age_lower_bound,
-    "age_upper_bound": age_upper_bound,
-    "place_of_death": place_of_death,
-    "marital_status": marital_status,
-    "day_of_week_of_death": day_of_week_of_death,
-    "injury_at_work": injury_at_work,
-    "manner_of_death": manner_of_death,
-    "method_of_disposition": method_of_disposition,
-    "autopsy": autopsy,
-    "activity_code": activity_code,
-    "place_of_injury": place_of_injury,
-    "icd_code": icd_code,
-    "cause_recode_358": cause_recode_358,
-    "cause_recode_113": cause_recode_113,
-    "infant_cause_recode_130": infant_cause_recode_130,
-    "cause_recode_39": cause_recode_39,
-    "entity_axis_conditions": entity_axis_conditions,
-    "record_axis_conditions": record_axis_conditions,
-    "race_recode_6": race_recode_6,
-    "hispanic_origin": hispanic_origin,
-    "hispanic_origin_race_recode": hispanic_origin_race_recode,
-    "race_recode_40": race_recode_40,
-    "decedent_occupation_code": decedent_occupation_code,
-    "decedent_occupation_recode": decedent_occupation_recode,
-    "decedent_industry_code": decedent_industry_code,
-    "decedent_industry_recode": decedent_industry_recode,
-}
+dataset_schema: Final[Mapping[str, pl.PolarsDataType]] = MappingProxyType(
+    {
+        "record_type": record_type,
+        "resident_status": resident_status,
+        "education": education,
+        "month_of_death": month_of_death,
+        "sex": sex,
+        "age_lower_bound": age_lower_bound,
+        "age_upper_bound": age_upper_bound,
+        "place_of_death": place_of_death,
+        "marital_status": marital_status,
+        "day_of_week_of_death": day_of_week_of_death,
+        "injury_at_work": injury_at_work,
+        "manner_of_death": manner_of_death,
+        "method_of_disposition": method_of_disposition,
+        "autopsy": autopsy,
+        "activity_code": activity_code,
+        "place_of_injury": place_of_injury,
+        "icd_code": icd_code,
+        "cause_recode_358": cause_recode_358,
+        "cause_recode_113": cause_recode_113,
+        "infant_cause_recode_130": infant_cause_recode_130,
+        "cause_recode_39": cause_recode_39,
+        "entity_axis_certificate_parts": entity_axis_certificate_parts,
+        "entity_axis_certificate_lines": entity_axis_certificate_lines,
+        "entity_axis_conditions": entity_axis_conditions,
+        "record_axis_conditions": record_axis_conditions,
+        "race_recode_6": race_recode_6,
+        "hispanic_origin": hispanic_origin,
+        "hispanic_origin_race_recode": hispanic_origin_race_recode,
+        "race_recode_40": race_recode_40,
+        "decedent_occupation_code": decedent_occupation_code,
+        "decedent_occupation_recode": decedent_occupation_recode,
+        "decedent_industry_code": decedent_industry_code,
+        "decedent_industry_recode": decedent_industry_recode,
+    }
+)
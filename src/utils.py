@@ -1,42 +1,6 @@
-from resulty import Ok, Err, Result
 from typing import Optional
 
 
-def maybe_del[K, V](d: dict[K, V], key: K) -> None:
-    """
-    Removes the specified key from the dictionary if it exists.
-
-    Args:
-        d (dict): The dictionary to remove the key from.
-        key: The key to be removed.
-
-    Returns:
-        None
-    """
-    try:
-        del d[key]
-    except KeyError:
-        pass
-
-
-def try_parse_int(s: str) -> Result[int, str]:
-    """
-    Tries to parse a string as an integer.
-
-    Args:
-      s (str): The string to be parsed.
-
-    Returns:
-      Result[int, str]: A Result object containing the parsed integer or an error message.
-
-    """
-    try:
-        i = int(s)
-        return Ok(i)
-    except ValueError:
-        return Err(f"Could not parse '{s}' as an integer.")
-
-
 type RangeKeyedDict[V] = dict[tuple[int, int], V]
 
 
@@ -58,16 +22,16 @@ def get_in_range[V](d: RangeKeyedDict[V], v: int) -> Optional[V]:
     return None
 
 
-def range_keyed_dict_has_key[V](d: RangeKeyedDict[V], v: int) -> bool:
+def range_keyed_dict_to_table[V](d: RangeKeyedDict[V], size: int) -> list[Optional[V]]:
     """
-    Checks if the given value is within the range of any key in the dictionary.
+    Expands a range-keyed dictionary into a table indexed by value.
 
     Args:
-      d (dict[tuple[int, int], T]): The dictionary to search.
-      v (int): The value to search for.
+      d (dict[tuple[int, int], T]): The dictionary to expand.
+      size (int): The number of values in the table, from 0 up to size - 1.
 
     Returns:
-      bool: True if the value is within the range of any key, False otherwise.
+      list[Optional[T]]: The value corresponding to each index, or None if no such value exists.
 
     """
-    return any(start <= v <= end for (start, end) in d.keys())
+    return [get_in_range(d, v) for v in range(size)]